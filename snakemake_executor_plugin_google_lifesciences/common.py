@@ -1,5 +1,4 @@
-from google.api_core import retry
-from requests.exceptions import ReadTimeout
+import hashlib
 
 def google_cloud_retry_predicate(ex):
     """Given an exception from Google Cloud, determine if it's one in the
@@ -13,14 +12,48 @@ def google_cloud_retry_predicate(ex):
       ex (Exception) : the exception passed from the decorated function
     Returns: boolean to indicate doing retry (True) or not (False)
     """
+    # Imported here so that importing this module (plugin discovery)
+    # does not pay the google client library import cost up front.
+    from google.api_core import retry
+    from googleapiclient.errors import HttpError
+    from requests.exceptions import ReadTimeout
+
     # Most likely case is Google API transient error.
     if retry.if_transient_error(ex):
         return True
     # Timeouts should be considered for retry as well.
     if isinstance(ex, ReadTimeout):
         return True
+    # The discovery client wraps server side errors in HttpError; retry
+    # throttling and 5xx responses like their api_core equivalents, but
+    # not permanent errors such as 403/404.
+    if isinstance(ex, HttpError):
+        return ex.resp.status == 429 or ex.resp.status >= 500
+    # Dropped connections (e.g. BrokenPipeError) from the underlying
+    # http libraries are transient by nature.
+    if isinstance(ex, (ConnectionError, TimeoutError)):
+        return True
     return False
 
+def file_sha256(filename, bufsize=1024 * 1024):
+    """Compute the sha256 digest of a file, reading it in chunks.
+
+    Uses hashlib.file_digest where available (Python 3.11+), which hashes
+    in C and releases the GIL, so calls can be parallelized with threads.
+
+    Arguments:
+      filename (str) : path of the file to hash
+      bufsize (int) : chunk size used for reading, default 1 MiB
+    Returns: the raw digest bytes
+    """
+    with open(filename, "rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").digest()
+        hasher = hashlib.sha256()
+        for chunk in iter(lambda: f.read(bufsize), b""):
+            hasher.update(chunk)
+        return hasher.digest()
+
 def bytesto(bytes, to, bsize=1024):
     """convert bytes to megabytes.
     bytes to mb: bytesto(bytes, 'm')